@@ -1,10 +1,28 @@
-from bs4 import BeautifulSoup  # Keep for potential future HTML parsing needs
 import requests
-from ics import Calendar, Event
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from datetime import datetime, timedelta, timezone
-import re
+from concurrent.futures import ThreadPoolExecutor
+import os
+import sys
+import time
+import uuid
+import logging
+import threading
 import json
-import pandas
+
+# orjson parses and serializes JSON several times faster than the standard library;
+# fall back to json when it is not installed (e.g. a bare local environment)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# ciso8601 is a C ISO 8601 parser, faster than datetime.fromisoformat; optional for the same reason
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
 
 """
 Soccer Schedule Scraper Lambda Function
@@ -17,6 +35,217 @@ It's designed to be called from the portfolio website through AWS Lambda,
 with authentication handled via Cognito Identity Pool.
 """
 
+# Module logger. Debug output is level-gated and lazily formatted, so it costs nothing in
+# production; set the LOG_LEVEL environment variable (e.g. DEBUG, WARNING) to adjust.
+# An unrecognised level name falls back to INFO instead of failing every cold start.
+logger = logging.getLogger(__name__)
+_log_level = logging.getLevelName(os.environ.get('LOG_LEVEL', 'INFO').upper())
+logger.setLevel(_log_level if isinstance(_log_level, int) else logging.INFO)
+
+# Upper bound on how many team schedules are fetched from the LPS API at the same time.
+# Each fetch is almost entirely network wait, so a handful of threads is enough to
+# overlap every request in a typical multi-team call without hammering the API.
+_MAX_FETCH_WORKERS = 8
+
+# Upper bound on how many team IDs a single fetch request may contain. Requests above
+# this are rejected before validation so a huge comma-separated list cannot drive the
+# validator or fan out into an unbounded number of outbound LPS API calls.
+_MAX_TEAM_IDS = 20
+
+# Mountain Time offset used for game times; built once and shared by every call
+_MT_TZ = timezone(timedelta(hours=-7))
+
+# Every game is played at the same venue and lasts the same amount of time
+_GAME_LOCATION = "Let's Play Soccer, Boise, 11448 W President Dr #8967, Boise, ID 83713, USA"
+_GAME_DURATION = timedelta(minutes=45)
+
+# Response headers shared by every lambda_handler return path. They are returned by
+# reference; the Lambda runtime only serializes them, so no copy is needed per response.
+_CORS_HEADERS = {'Access-Control-Allow-Origin': '*'}
+_JSON_HEADERS = {'Content-Type': 'application/json', **_CORS_HEADERS}
+_ICS_DOWNLOAD_HEADERS = {
+    'Content-Type': 'text/calendar',
+    **_CORS_HEADERS,
+    'Content-Disposition': 'attachment; filename="soccer_schedule_{season}.ics"'
+}
+
+# Weekday abbreviations indexed by datetime.weekday(), for the fixed game display format
+_WEEKDAY_ABBREVIATIONS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+
+# Teams whose games get a "Special Event" title; a frozenset gives O(1) membership checks
+_SPECIAL_TEAMS = frozenset({'MIXED BAG FC', 'LOOKING TO SCORE', 'NO BUENO O30', 'EYE CANDY'})
+
+# RFC 5545 TEXT escaping: backslash, semicolon, comma and newline must be escaped in values.
+# Other control characters (including a bare CR, which lenient parsers treat as a line
+# break) are not allowed in TEXT and are dropped, since download bodies come from the client.
+_ICS_ESCAPE_TABLE = str.maketrans({
+    **{chr(code): None for code in range(0x20) if chr(code) not in '\t\n'},
+    '\x7f': None,
+    '\\': '\\\\', ';': '\\;', ',': '\\,', '\n': '\\n',
+})
+
+# Fixed opening of every generated calendar: metadata plus the America/Denver timezone
+# definition that each event's DTSTART refers to. ICS lines must end in CRLF.
+_ICS_HEADER = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "PRODID:Soccer Schedule API\r\n"
+    "BEGIN:VTIMEZONE\r\n"
+    "TZID:America/Denver\r\n"
+    "BEGIN:STANDARD\r\n"
+    "DTSTART:20241103T020000\r\n"
+    "TZOFFSETFROM:-0600\r\n"
+    "TZOFFSETTO:-0700\r\n"
+    "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU\r\n"
+    "END:STANDARD\r\n"
+    "BEGIN:DAYLIGHT\r\n"
+    "DTSTART:20250309T020000\r\n"
+    "TZOFFSETFROM:-0700\r\n"
+    "TZOFFSETTO:-0600\r\n"
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU\r\n"
+    "END:DAYLIGHT\r\n"
+    "END:VTIMEZONE\r\n"
+)
+_ICS_FOOTER = "END:VCALENDAR\r\n"
+
+# Reminder attached to every game, 40 minutes before kickoff
+_ICS_VALARM = (
+    "BEGIN:VALARM\r\n"
+    "ACTION:DISPLAY\r\n"
+    "DESCRIPTION:Reminder: Soccer game starting soon\r\n"
+    "TRIGGER:-PT40M\r\n"
+    "END:VALARM\r\n"
+)
+
+# The location never changes, so escape it once instead of once per event
+_ICS_LOCATION = _GAME_LOCATION.translate(_ICS_ESCAPE_TABLE)
+_ICS_DURATION = f"PT{int(_GAME_DURATION.total_seconds()) // 60}M"
+
+def _build_http_session() -> requests.Session:
+    """
+    Build the shared HTTP session used for every LPS API request.
+    
+    The session keeps TLS connections to the API host alive between requests, so
+    fetching several teams (or serving several warm Lambda invocations) only pays
+    for the TCP/TLS handshake once. Transient gateway errors are retried briefly.
+    
+    Returns:
+        requests.Session: Session with a pooled, retrying HTTPS adapter mounted
+    """
+    session = requests.Session()
+    
+    # Pool enough connections for every concurrent fetch worker to hold its own socket.
+    # Read timeouts are never retried: a slow API would otherwise cost up to three full
+    # read timeouts (past API Gateway's 29s limit) and surface as a ConnectionError
+    # instead of the Timeout that get_team_schedule_from_api reports to the user.
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=_MAX_FETCH_WORKERS,
+        max_retries=Retry(total=2, read=False, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    )
+    session.mount('https://', adapter)
+    
+    # Identify ourselves and ask for JSON. Accept-Encoding is left to requests, which
+    # advertises gzip/deflate and adds br automatically when the brotli package is installed
+    session.headers.update({
+        'Accept': 'application/json',
+        'User-Agent': 'soccer-schedule-scraper'
+    })
+    return session
+
+# Created at import time so the connection pool survives across warm Lambda invocations
+_SESSION = _build_http_session()
+
+# In-process cache of team schedules. Warm Lambda containers keep module state between
+# invocations, so repeat requests for the same team within the TTL skip the API entirely.
+# Entries are (monotonic timestamp, (games, season, team_name)) kept in least-recently-used
+# order; the lock guards reordering and eviction against concurrent fetch threads.
+# LPS schedules change a few times a day at most, so a 15 minute TTL is safe. Set
+# CACHE_ENABLED=false to turn the cache off (e.g. while debugging against the live API)
+# and SCHEDULE_CACHE_TTL_SECONDS to tune the TTL without a code change.
+_DEFAULT_SCHEDULE_CACHE_TTL_SECONDS = 900.0
+
+def _read_cache_ttl_seconds():
+    """
+    Read the schedule cache TTL from SCHEDULE_CACHE_TTL_SECONDS.
+    
+    A malformed value falls back to the default instead of failing at import (which would
+    break every cold start), and negative values are clamped to 0 (cache entries expire
+    immediately).
+    
+    Returns:
+        float: TTL in seconds
+    """
+    raw_ttl = os.environ.get('SCHEDULE_CACHE_TTL_SECONDS')
+    if raw_ttl is None:
+        return _DEFAULT_SCHEDULE_CACHE_TTL_SECONDS
+    try:
+        ttl_seconds = float(raw_ttl)
+    except ValueError:
+        ttl_seconds = None
+    # float() also accepts 'nan', which would never compare as expired, so reject it too
+    if ttl_seconds is None or ttl_seconds != ttl_seconds:
+        logger.warning("Invalid SCHEDULE_CACHE_TTL_SECONDS %r, using %s seconds",
+                       raw_ttl, _DEFAULT_SCHEDULE_CACHE_TTL_SECONDS)
+        return _DEFAULT_SCHEDULE_CACHE_TTL_SECONDS
+    return max(ttl_seconds, 0.0)
+
+_SCHEDULE_CACHE_ENABLED = os.environ.get('CACHE_ENABLED', 'true').lower() not in ('0', 'false', 'no')
+_SCHEDULE_CACHE_TTL_SECONDS = _read_cache_ttl_seconds()
+_SCHEDULE_CACHE_MAX_ENTRIES = 512
+_SCHEDULE_CACHE = {}
+_SCHEDULE_CACHE_LOCK = threading.Lock()
+
+# Python 3.11+ datetime.fromisoformat accepts a trailing 'Z' natively, so no string rewrite is needed
+_FROMISOFORMAT_HANDLES_Z = sys.version_info >= (3, 11)
+
+def _json_dumps(obj) -> str:
+    """
+    Serialize an object to a JSON string, using orjson when available.
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        str: JSON text (API Gateway requires a str body, so orjson bytes are decoded)
+    """
+    if orjson is not None:
+        return orjson.dumps(obj).decode('utf-8')
+    return json.dumps(obj)
+
+def _json_loads(data):
+    """
+    Parse JSON text or bytes, using orjson when available.
+    
+    Args:
+        data (str | bytes): JSON document
+        
+    Returns:
+        The parsed object
+        
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON (orjson's error subclasses it)
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _is_valid_team_id(team_id) -> bool:
+    """
+    Check whether a team ID is six ASCII digits and not all zeros.
+    
+    This is the cheap common-case check: a handful of C-level string operations
+    with no regex and no exception handling.
+    
+    Args:
+        team_id: The team ID to check
+        
+    Returns:
+        bool: True if the team ID is valid
+    """
+    return (isinstance(team_id, str) and len(team_id) == 6 and team_id.isascii()
+            and team_id.isdigit() and team_id != '000000')
+
 def validate_team_id(team_id: str) -> bool:
     """
     Validate that a team ID is properly formatted.
@@ -30,32 +259,235 @@ def validate_team_id(team_id: str) -> bool:
     Raises:
         ValueError: If the team ID is invalid with specific error message
     """
+    # Valid IDs return straight away; the checks below only run to explain a failure
+    if _is_valid_team_id(team_id):
+        return True
+    
     if not isinstance(team_id, str):
         raise ValueError("Team ID must be a string")
     if not team_id.strip():
         raise ValueError("Team ID cannot be empty")
-    if not re.match(r'^\d{6}$', team_id):
+    if not (len(team_id) == 6 and team_id.isascii() and team_id.isdigit()):
         raise ValueError(f"Team ID '{team_id}' must be exactly 6 digits")
-    # Ensure it's a positive integer when parsed
+    # Six ASCII digits are always a valid number, so the only remaining failure is '000000'
+    raise ValueError(f"Team ID '{team_id}' must be a positive number")
+
+def _parse_game_datetime(game_datetime: str) -> datetime:
+    """
+    Parse an LPS API game timestamp into a Mountain Time aware datetime.
+    
+    The API marks game times with a 'Z' suffix even though the clock reading is
+    Mountain Time, so the parsed wall-clock value is kept and tagged with _MT_TZ.
+    
+    Args:
+        game_datetime (str): ISO 8601 timestamp from the API's SchedGameDateTime field
+        
+    Returns:
+        datetime: Parsed game time
+        
+    Raises:
+        ValueError: If the timestamp is not valid ISO 8601
+    """
+    has_z_suffix = game_datetime.endswith('Z')
+    
+    # Prefer the C parser; otherwise newer interpreters parse the 'Z' directly
+    # and older ones need it trimmed first
+    if ciso8601 is not None:
+        parsed_date = ciso8601.parse_datetime(game_datetime)
+    elif not has_z_suffix or _FROMISOFORMAT_HANDLES_Z:
+        parsed_date = datetime.fromisoformat(game_datetime)
+    else:
+        parsed_date = datetime.fromisoformat(game_datetime[:-1])
+    
+    if has_z_suffix:
+        return parsed_date.replace(tzinfo=_MT_TZ)
+    return parsed_date
+
+def _get_cached_schedule(team_id):
+    """
+    Look up a team's schedule in the in-process cache.
+    
+    Args:
+        team_id (str): The 6-digit team ID
+        
+    Returns:
+        tuple | None: (games, season, team_name) if a fresh entry exists, otherwise None
+    """
+    if not _SCHEDULE_CACHE_ENABLED:
+        return None
+    with _SCHEDULE_CACHE_LOCK:
+        entry = _SCHEDULE_CACHE.get(team_id)
+        if entry is None:
+            return None
+        cached_at, schedule = entry
+        if time.monotonic() - cached_at >= _SCHEDULE_CACHE_TTL_SECONDS:
+            # Expired; drop it so the next lookup goes back to the API
+            del _SCHEDULE_CACHE[team_id]
+            return None
+        # Move the hit to the most-recently-used end so eviction drops cold teams first
+        _SCHEDULE_CACHE[team_id] = _SCHEDULE_CACHE.pop(team_id)
+        return schedule
+
+def _store_cached_schedule(team_id, schedule):
+    """
+    Store a team's schedule in the in-process cache, evicting old entries when full.
+    
+    Args:
+        team_id (str): The 6-digit team ID
+        schedule (tuple): (games, season, team_name) as returned by get_team_schedule_from_api
+    """
+    if not _SCHEDULE_CACHE_ENABLED:
+        return
+    now = time.monotonic()
+    with _SCHEDULE_CACHE_LOCK:
+        if team_id not in _SCHEDULE_CACHE and len(_SCHEDULE_CACHE) >= _SCHEDULE_CACHE_MAX_ENTRIES:
+            # Drop expired entries first, then the least recently used entry if still full
+            expired_ids = [cached_id for cached_id, (cached_at, _) in _SCHEDULE_CACHE.items()
+                           if now - cached_at >= _SCHEDULE_CACHE_TTL_SECONDS]
+            for cached_id in expired_ids:
+                del _SCHEDULE_CACHE[cached_id]
+            if len(_SCHEDULE_CACHE) >= _SCHEDULE_CACHE_MAX_ENTRIES:
+                del _SCHEDULE_CACHE[next(iter(_SCHEDULE_CACHE))]
+        # Re-insert at the most-recently-used end
+        _SCHEDULE_CACHE.pop(team_id, None)
+        _SCHEDULE_CACHE[team_id] = (now, schedule)
+
+def _drop_started_cached_games(schedule, current_date):
+    """
+    Re-apply the upcoming-games cutoff to a schedule served from the cache.
+    
+    Cached game lists were filtered against the cutoff of the call that fetched them,
+    so games that have started since then must be dropped for the current caller.
+    
+    Args:
+        schedule (tuple): (games, season, team_name) as stored in the cache
+        current_date (datetime): Games starting before this are dropped
+        
+    Returns:
+        tuple: The cached schedule itself if nothing was dropped, otherwise a new
+            (games, season, team_name) tuple with only the upcoming games
+        
+    Raises:
+        ValueError: If every cached game has already started
+    """
+    games, season, team_name = schedule
+    # date_str is the aware ISO string built from the parsed game time, so it compares
+    # directly against the aware cutoff
+    upcoming_games = [game for game in games if datetime.fromisoformat(game['date_str']) >= current_date]
+    if not upcoming_games:
+        raise ValueError("No upcoming games found for the provided team.")
+    if len(upcoming_games) == len(games):
+        return schedule
+    return (upcoming_games, season, team_name)
+
+def _current_mountain_time():
+    """
+    Get the current Mountain Time, rounded to the minute, used to filter out past games.
+    
+    Returns:
+        datetime: Timezone-aware current time
+    """
+    now = datetime.now(_MT_TZ)
+    current_minute = now.replace(second=0, microsecond=0)
+    # Round to the nearest minute rather than truncating, as the previous pandas round('min') did
+    if now.second >= 30:
+        current_minute += timedelta(minutes=1)
+    return current_minute
+
+def _build_game_entry(game, team_id, season, team_name, current_date):
+    """
+    Turn one raw LPS API game into the game dictionary returned to callers.
+    
+    Args:
+        game (dict): Raw game object from the API's games list
+        team_id (str): The team the schedule was fetched for
+        season (str): Season reported by the API
+        team_name (str): Team name reported by the API
+        current_date (datetime): Games starting before this are dropped
+        
+    Returns:
+        dict | None: The game dictionary, or None if the game is in the past or unusable
+    """
     try:
-        num_id = int(team_id)
-        if num_id <= 0:
-            raise ValueError(f"Team ID '{team_id}' must be a positive number")
-        return True
-    except ValueError as e:
-        if "must be" in str(e):
-            raise e
-        raise ValueError(f"Team ID '{team_id}' must be a valid number")
+        # Read the game time first: past games are skipped before any other field is touched
+        game_datetime = game.get("SchedGameDateTime")
+        if not game_datetime:
+            logger.warning("Missing game data for game in team %s", team_id)
+            return None
+        
+        # Parse the game datetime from ISO format
+        try:
+            game_date = _parse_game_datetime(game_datetime)
+        except ValueError as e:
+            logger.warning("Error parsing date for game: %s - %s", game_datetime, e)
+            return None
+        
+        # Only show future games (may add an option to include past games).
+        # Past games are dropped here, before any extraction or formatting work is spent on them.
+        if game_date < current_date:
+            return None
+        
+        # Extract the remaining game details, looking each key up only once
+        game_id = game.get("game_id", "")
+        field_name = game.get("field_name")
+        field = field_name.replace("Field ", "") if field_name else str(game.get("Field", ""))
+        
+        # Get home and away team info; "or {}" also covers teams sent as null
+        home_team = (game.get("home_team") or {}).get("team_name")
+        away_team = (game.get("visitor_team") or {}).get("team_name")
+        
+        # Plain short-circuiting check instead of building a list for all()
+        if not (field and home_team and away_team):
+            logger.warning("Missing game data for game in team %s", team_id)
+            return None
+        
+        # Format the date as it was in the original scraper ("%a %m/%d %I:%M %p"), built
+        # directly so no strftime/locale lookup runs per game
+        hour = game_date.hour
+        formatted_date = (
+            f"{_WEEKDAY_ABBREVIATIONS[game_date.weekday()]} "
+            f"{game_date.month:02d}/{game_date.day:02d} "
+            f"{hour % 12 or 12:02d}:{game_date.minute:02d} {'AM' if hour < 12 else 'PM'}"
+        )
+        
+        # Convert to string with timezone info, plus the ICS-ready start time so
+        # calendar generation does not have to parse the date again
+        game_str = game_date.isoformat()
+        local_dtstart = _to_ics_local_dtstart(game_date)
+        
+        # Team/season reference fields are filled in here, while every value is
+        # already a local, so callers never need a second pass over the games
+        return {
+            'game_id': game_id,
+            'date': formatted_date,
+            'date_str': game_str,
+            'local_dtstart': local_dtstart,
+            'field': field,
+            'home_team': home_team,
+            'away_team': away_team,
+            'team_id': team_id,
+            'season': season,
+            'team_name': team_name,
+            'id': f"{season}_{formatted_date}_{home_team}_{away_team}_{field}"
+        }
+    
+    except Exception as e:
+        logger.warning("Error parsing game data for team %s: %s", team_id, e)
+        return None
 
-def get_team_schedule_from_api(team_id):
+def get_team_schedule_from_api(team_id, force_refresh=False, current_date=None):
     """
     Fetch team schedule data from the LPS API.
     
     Args:
         team_id (str): The 6-digit team ID to fetch schedule for
+        force_refresh (bool): Skip the in-process cache and always query the API
+        current_date (datetime, optional): Cutoff for upcoming games. Callers fetching
+            several teams pass one shared value; defaults to the current Mountain Time.
         
     Returns:
-        tuple: (list of game dictionaries, season string, team_name string)
+        tuple: (list of game dictionaries, season string, team_name string).
+            Each game dictionary includes team_id, season, team_name and a composite id.
         
     Raises:
         ValueError: For validation or data structure errors
@@ -67,12 +499,25 @@ def get_team_schedule_from_api(team_id):
     except ValueError as e:
         raise ValueError(str(e))
     
+    # Get current date with timezone info to match the game dates, unless the caller supplied one
+    if current_date is None:
+        current_date = _current_mountain_time()
+    
+    # Serve recently fetched schedules from the in-process cache unless a refresh was requested.
+    # The cutoff is re-applied so games that started since the fetch are not returned.
+    if not force_refresh:
+        cached_schedule = _get_cached_schedule(team_id)
+        if cached_schedule is not None:
+            logger.debug("Cache hit for team %s", team_id)
+            return _drop_started_cached_games(cached_schedule, current_date)
+    
     # URL of the API endpoint
     url = f"https://lps-api-prod.lps-test.com/teams/{team_id}"
 
     # Fetch the data from API
     try:
-        response = requests.get(url, timeout=10)  # Add timeout for better error handling
+        # Separate connect/read timeouts: fail fast on an unreachable host, allow 10s for the body
+        response = _SESSION.get(url, timeout=(3.05, 10))
         response.raise_for_status()  # Raise exception for bad status codes
     except requests.Timeout:
         raise RuntimeError(f"Request timed out while fetching schedule for team {team_id}. Please try again.")
@@ -83,7 +528,8 @@ def get_team_schedule_from_api(team_id):
     
     # Parse JSON response
     try:
-        data = response.json()
+        # Parse the raw bytes directly rather than letting requests decode them to str first
+        data = _json_loads(response.content)
     except json.JSONDecodeError as e:
         raise RuntimeError(f"Failed to parse API response for team {team_id}: {str(e)}")
     
@@ -101,161 +547,208 @@ def get_team_schedule_from_api(team_id):
     TEAM_NAME = team_data.get("team_name", "Unknown Team")
     
     # Debug log
-    print(f"Team Name: {TEAM_NAME}, Season: {SEASON}")
+    logger.debug("Team Name: %s, Season: %s", TEAM_NAME, SEASON)
     
     # Get games data
     if "games" not in data or not isinstance(data["games"], list):
         raise ValueError(f"No games data found for team {team_id}")
     
-    # Process games
-    all_games = []
-    # Get current date with timezone info to match the game dates
-    mt_offset = -7  # Mountain Time offset
-    tz = timezone(timedelta(hours=mt_offset))
-    current_date = (pandas.to_datetime(datetime.now(tz))).round('min')
+    logger.debug("Current date: %s", current_date)
     
-    print(f"Current date: {current_date}")  # Debug log
-    
-    for game in data["games"]:
-        try:
-            # Extract game details
-            game_id = game.get("game_id", "")
-            game_datetime = game.get("SchedGameDateTime")
-            field = game.get("field_name", "").replace("Field ", "") if game.get("field_name") else str(game.get("Field", ""))
-            
-            # Get home and away team info
-            home_team = game.get("home_team", {}).get("team_name", "")
-            away_team = game.get("visitor_team", {}).get("team_name", "")
-            
-            if not all([game_datetime, field, home_team, away_team]):
-                print(f"Warning: Missing game data for game in team {team_id}")
-                continue
-            
-            # Parse the game datetime from ISO format
-            try:
-                game_date = datetime.fromisoformat(game_datetime.replace("Z", "-07:00"))
-                
-                # Format the date as it was in the original scraper
-                formatted_date = game_date.strftime("%a %m/%d %I:%M %p")
-                
-                # Convert to string with timezone info for passing to ICS
-                game_str = game_date.isoformat()
-
-                # Only show future games (may add an option to include past games)
-                if game_date >= current_date:
-                    all_games.append({
-                        'game_id': game_id,
-                        'date': formatted_date,
-                        'date_str': game_str,
-                        'field': field,
-                        'home_team': home_team,
-                        'away_team': away_team
-                    })
-            except ValueError as e:
-                print(f"Warning: Error parsing date for game: {game_datetime} - {e}")
-                continue
-                
-        except Exception as e:
-            print(f"Warning: Error parsing game data for team {team_id}: {e}")
-            continue
+    # Process games: build every upcoming game in one comprehension. _build_game_entry
+    # returns None for past or malformed games, so they are filtered out without a
+    # separate append loop
+    all_games = [
+        game_entry for game in data["games"]
+        if (game_entry := _build_game_entry(game, team_id, SEASON, TEAM_NAME, current_date)) is not None
+    ]
     
     if not all_games:
         raise ValueError(f"No upcoming games found for the provided team.")
     
-    print(f"Found {len(all_games)} games for team {team_id}")
-    return all_games, SEASON, TEAM_NAME
+    logger.info("Found %d games for team %s", len(all_games), team_id)
+    schedule = (all_games, SEASON, TEAM_NAME)
+    _store_cached_schedule(team_id, schedule)
+    return schedule
+
+def _to_ics_local_dtstart(game_datetime: datetime) -> str:
+    """
+    Format a game time as the Mountain Time wall clock used in DTSTART;TZID=America/Denver.
+    
+    Args:
+        game_datetime (datetime): Game time; naive values are taken as Mountain Time
+        
+    Returns:
+        str: Timestamp in ICS local form, e.g. '20250305T190000'
+    """
+    # Ensure the datetime is expressed in Mountain Time, since DTSTART is written
+    # as a wall-clock time referencing the America/Denver VTIMEZONE
+    if game_datetime.tzinfo is None:
+        game_datetime = game_datetime.replace(tzinfo=_MT_TZ)
+    else:
+        game_datetime = game_datetime.astimezone(_MT_TZ)
+    return (f"{game_datetime.year:04d}{game_datetime.month:02d}{game_datetime.day:02d}"
+            f"T{game_datetime.hour:02d}{game_datetime.minute:02d}{game_datetime.second:02d}")
+
+def _is_ics_local_dtstart(value) -> bool:
+    """
+    Check that a value has the 'YYYYMMDDTHHMMSS' shape produced by _to_ics_local_dtstart.
+    
+    Games for the download action come back from the browser, so a precomputed
+    local_dtstart is only trusted when it cannot inject anything into the ICS text.
+    
+    Args:
+        value: Candidate local_dtstart value
+        
+    Returns:
+        bool: True if the value can be written into DTSTART as-is
+    """
+    return (isinstance(value, str) and len(value) == 15 and value[8] == 'T'
+            and value.isascii() and value[:8].isdigit() and value[9:].isdigit())
+
+def _local_dtstart_matches_date_str(local_dtstart: str, date_str) -> bool:
+    """
+    Check that a precomputed local_dtstart is the same start time as the game's date_str.
+    
+    Fetched games carry date_str as 'YYYY-MM-DDTHH:MM:SS-07:00', whose digits are already
+    the Mountain Time wall clock, so agreement is a string comparison rather than a parse.
+    Any other date_str shape reports a mismatch and the caller parses date_str instead.
+    
+    Args:
+        local_dtstart (str): Well-formed 'YYYYMMDDTHHMMSS' value from the game
+        date_str: The game's date_str value as sent by the client
+        
+    Returns:
+        bool: True if local_dtstart can be used in place of parsing date_str
+    """
+    return (isinstance(date_str, str) and len(date_str) == 25 and date_str.endswith('-07:00')
+            and date_str[:19].replace('-', '').replace(':', '') == local_dtstart)
+
+def _format_event(game, dtstamp):
+    """
+    Render one game as an ICS VEVENT block.
+    
+    Args:
+        game (dict): Game dictionary with field, home_team, away_team, an ISO date_str
+            and optionally the precomputed local_dtstart
+        dtstamp (str): UTC creation timestamp shared by every event in the calendar
+        
+    Returns:
+        str: CRLF-terminated VEVENT text including the reminder alarm
+    """
+    # date_str is the documented start time and always wins. The start time precomputed
+    # during the fetch is only used when it agrees with date_str, so a client that edits
+    # just date_str still gets the right DTSTART; otherwise (or for games saved by an
+    # older client without local_dtstart) the ISO date string is parsed
+    local_dtstart = game.get('local_dtstart')
+    date_str = game.get('date_str')
+    if not _is_ics_local_dtstart(local_dtstart):
+        local_dtstart = _to_ics_local_dtstart(datetime.fromisoformat(game['date_str']))
+    elif date_str is not None and not _local_dtstart_matches_date_str(local_dtstart, date_str):
+        local_dtstart = _to_ics_local_dtstart(datetime.fromisoformat(date_str))
+    
+    home_team = game['home_team']
+    away_team = game['away_team']
+    matchup = f"{home_team} vs {away_team}"
+    
+    # Special teams get their own title prefix and sign-off. Download bodies come from the
+    # client, so non-str team values (possibly unhashable, e.g. lists) are simply not special
+    # instead of raising TypeError on the frozenset lookup
+    if ((isinstance(home_team, str) and home_team in _SPECIAL_TEAMS)
+            or (isinstance(away_team, str) and away_team in _SPECIAL_TEAMS)):
+        name = f"Special Event: {matchup}"
+        sign_off = "Ahhh shit, here we go again..."
+    else:
+        name = matchup
+        sign_off = "GLHF!"
+    description = f"Field {game['field']}\nSoccer game at Let's Play Soccer\n{matchup}\n{sign_off}"
+    
+    return (
+        "BEGIN:VEVENT\r\n"
+        f"UID:{uuid.uuid4()}@soccer-schedule-api\r\n"
+        f"DTSTAMP:{dtstamp}\r\n"
+        f"DTSTART;TZID=America/Denver:{local_dtstart}\r\n"
+        f"DURATION:{_ICS_DURATION}\r\n"
+        f"SUMMARY:{name.translate(_ICS_ESCAPE_TABLE)}\r\n"
+        f"LOCATION:{_ICS_LOCATION}\r\n"
+        f"DESCRIPTION:{description.translate(_ICS_ESCAPE_TABLE)}\r\n"
+        f"{_ICS_VALARM}"
+        "END:VEVENT\r\n"
+    )
+
+def _iter_calendar_chunks(selected_games):
+    """
+    Yield an ICS calendar for the given games piece by piece.
+    
+    Args:
+        selected_games (list): List of game dictionaries
+        
+    Yields:
+        str: The calendar header, one VEVENT block per game, then the footer
+    """
+    # One creation timestamp for the whole calendar, in UTC as RFC 5545 expects
+    dtstamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    
+    yield _ICS_HEADER
+    for game in selected_games:
+        yield _format_event(game, dtstamp)
+    yield _ICS_FOOTER
 
 def create_calendar_events(selected_games):
     """
     Create an ICS calendar file from a list of games with proper Mountain Time zone.
     
+    The calendar text is written directly from fixed templates rather than built
+    through an ICS object model, since every event has the same shape.
+    
     Args:
         selected_games (list): List of game dictionaries
         
     Returns:
         str: ICS calendar content as a string with proper timezone handling
     """
-    cal = Calendar()
-    mt_offset = -7
-    tz = timezone(timedelta(hours=mt_offset))
-    
-    # Add calendar metadata
-    cal.creator = 'Soccer Schedule API'
-    
-    for game in selected_games:
-        event = Event()
-        
-        # Convert the game date string to a datetime object with explicit Mountain Time zone
-        game_datetime = datetime.fromisoformat(game['date_str'])
-        
-        # Ensure the datetime has Mountain Time timezone info
-        if game_datetime.tzinfo is None:
-            game_datetime = game_datetime.replace(tzinfo=tz)
-        
-        # Add 7 hours to match UTC time as that is what will be serialized when making the ics file
-        utc_gametime = game_datetime - timedelta(hours=7)  # Add 7 hours to match UTC time
-        
-        # List of special teams
-        special_teams = ['MIXED BAG FC', 'LOOKING TO SCORE', 'NO BUENO O30', 'EYE CANDY']
-
-        event.name = f"{game['home_team']} vs {game['away_team']}"
-        event.begin = utc_gametime
-        event.duration = {'hours': .75}  # 45 minutes duration
-        event.location = f"Let's Play Soccer, Boise, 11448 W President Dr #8967, Boise, ID 83713, USA"
-        event.description = f"Field {game['field']}\nSoccer game at Let's Play Soccer\n{game['home_team']} vs {game['away_team']}\nGLHF!"
-
-        if game['home_team'] in special_teams or game['away_team'] in special_teams:
-            event.name = f"Special Event: {game['home_team']} vs {game['away_team']}"
-            event.description = f"Field {game['field']}\nSoccer game at Let's Play Soccer\n{game['home_team']} vs {game['away_team']}\nAhhh shit, here we go again..."
-        
-        cal.events.add(event)
-    
-    # Serialize the calendar to get the basic structure
-    ics_content = cal.serialize()
-    
-    # Fix timezone issues by replacing UTC timestamps with Mountain Time
-    # 1. Add the timezone definition
-    timezone_block = """
-BEGIN:VTIMEZONE
-TZID:America/Denver
-BEGIN:STANDARD
-DTSTART:20241103T020000
-TZOFFSETFROM:-0600
-TZOFFSETTO:-0700
-RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU
-END:STANDARD
-BEGIN:DAYLIGHT
-DTSTART:20250309T020000
-TZOFFSETFROM:-0700
-TZOFFSETTO:-0600
-RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU
-END:DAYLIGHT
-END:VTIMEZONE
-"""
+    return "".join(_iter_calendar_chunks(selected_games))
+
+def _iter_valid_team_ids(team_ids_param, invalid_team_ids, validation_errors):
+    """
+    Yield each valid, not yet seen team ID from a comma-separated query parameter.
     
-    # Insert the timezone block after BEGIN:VCALENDAR
-    ics_content = ics_content.replace("BEGIN:VCALENDAR", f"BEGIN:VCALENDAR\n{timezone_block}")
-    
-    # 2. Replace UTC timestamps with Mountain Time
-    # This pattern matches DTSTART with UTC time (Z suffix)
-    pattern_dt = r'DTSTART:(\d{8}T\d{6})Z'
-    
-    # Replace with TZID parameter format
-    replacement_dt = r'DTSTART;TZID=America/Denver:\1'
-    ics_content = re.sub(pattern_dt, replacement_dt, ics_content)
-    
-    # 3. Add VALARM components for reminders
-    pattern_valarm = r'(END:VEVENT)'
-    valarm_block = """
-BEGIN:VALARM
-ACTION:DISPLAY
-DESCRIPTION:Reminder: Soccer game starting soon
-TRIGGER:-PT40M
-END:VALARM
-"""
-    ics_content = re.sub(pattern_valarm, f"{valarm_block}\\1", ics_content)
+    Splitting, stripping, deduplication and validation all happen in one pass.
+    Rejected IDs are recorded in the caller's lists instead of being yielded.
     
-    return ics_content
+    Args:
+        team_ids_param (str): Comma-separated team IDs from the query string
+        invalid_team_ids (list): Receives {'id', 'reason'} dicts for rejected IDs
+        validation_errors (list): Receives the message of every failed validation
+        
+    Yields:
+        str: Valid team IDs in request order, without duplicates
+    """
+    seen_ids = set()
+    for raw_team_id in team_ids_param.split(','):
+        team_id = raw_team_id.strip()
+        if not team_id:
+            continue
+        
+        if team_id in seen_ids:
+            invalid_team_ids.append({
+                'id': team_id,
+                'reason': 'Duplicate team ID'
+            })
+            continue
+        
+        try:
+            validate_team_id(team_id)
+        except ValueError as e:
+            invalid_team_ids.append({
+                'id': team_id,
+                'reason': str(e)
+            })
+            validation_errors.append(str(e))
+            continue
+        
+        seen_ids.add(team_id)
+        yield team_id
 
 def lambda_handler(event, context):
     """
@@ -273,7 +766,7 @@ def lambda_handler(event, context):
         dict: Lambda response with appropriate status code and body
     """
     # Add version identifier for logging
-    print(f"Soccer Schedule API Version: 2025-03-03-v6")
+    logger.info("Soccer Schedule API Version: 2025-03-03-v6")
     
     query_params = event.get('queryStringParameters', {}) or {}  # Handle None case
     action = query_params.get('action', 'fetch')
@@ -281,55 +774,42 @@ def lambda_handler(event, context):
     if action == 'fetch':
         # FETCH ACTION: Get schedules for provided team IDs
         team_ids_param = query_params.get('team_ids')
+        # Optional ?refresh=true bypasses the schedule cache for manual invalidation
+        force_refresh = str(query_params.get('refresh', '')).lower() in ('1', 'true', 'yes')
         if not team_ids_param:
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
+                'headers': _JSON_HEADERS,
+                'body': _json_dumps({
                     'error': 'Team IDs are required. Please provide at least one valid 6-digit team ID.',
                     'errorType': 'ValidationError'
                 })
             }
         
-        # Split and clean team IDs
-        team_ids = [tid.strip() for tid in team_ids_param.split(',') if tid.strip()]
+        # Reject oversized requests up front, before any validation or API calls
+        requested_id_count = sum(1 for raw_team_id in team_ids_param.split(',') if raw_team_id.strip())
+        if requested_id_count > _MAX_TEAM_IDS:
+            logger.warning("Rejected request with %d team IDs (limit %d)", requested_id_count, _MAX_TEAM_IDS)
+            return {
+                'statusCode': 400,
+                'headers': _JSON_HEADERS,
+                'body': _json_dumps({
+                    'error': f'Too many team IDs. Please provide at most {_MAX_TEAM_IDS} team IDs per request.',
+                    'errorType': 'ValidationError'
+                })
+            }
         
-        # Validate and deduplicate team IDs with better error reporting
-        valid_team_ids = []
+        # Split, clean, deduplicate and validate team IDs in a single pass,
+        # collecting every rejected ID for better error reporting
         invalid_team_ids = []
-        seen_ids = set()
         validation_errors = []
-        
-        for team_id in team_ids:
-            if team_id in seen_ids:
-                invalid_team_ids.append({
-                    'id': team_id,
-                    'reason': 'Duplicate team ID'
-                })
-                continue
-                
-            try:
-                validate_team_id(team_id)
-                valid_team_ids.append(team_id)
-                seen_ids.add(team_id)
-            except ValueError as e:
-                invalid_team_ids.append({
-                    'id': team_id,
-                    'reason': str(e)
-                })
-                validation_errors.append(str(e))
+        valid_team_ids = list(_iter_valid_team_ids(team_ids_param, invalid_team_ids, validation_errors))
         
         if not valid_team_ids:
             return {
                 'statusCode': 400,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
+                'headers': _JSON_HEADERS,
+                'body': _json_dumps({
                     'error': 'No valid team IDs provided',
                     'errorType': 'ValidationError',
                     'invalid_ids': invalid_team_ids,
@@ -342,23 +822,29 @@ def lambda_handler(event, context):
         failed_teams = []
         
         try:
-            for team_id in valid_team_ids:
-                try:
-                    games, season, team_name = get_team_schedule_from_api(team_id)
-                    
-                    # Add team_id and season to each game for reference
-                    for game in games:
-                        game['team_id'] = team_id
-                        game['season'] = season
-                        game['team_name'] = team_name  # Add the team name from API to each game
-                        game['id'] = f"{season}_{game['date']}_{game['home_team']}_{game['away_team']}_{game['field']}"
-                        all_games.append(game)
-                except Exception as e:
-                    failed_teams.append({
-                        'team_id': team_id,
-                        'error': str(e),
-                        'errorType': e.__class__.__name__
-                    })
+            # Fetch all teams concurrently so total latency is roughly the slowest
+            # single request instead of the sum of every request
+            # Every team in this request shares one "now" so they filter past games identically
+            current_date = _current_mountain_time()
+            max_workers = min(_MAX_FETCH_WORKERS, len(valid_team_ids))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                team_futures = [
+                    (team_id, executor.submit(get_team_schedule_from_api, team_id, force_refresh, current_date))
+                    for team_id in valid_team_ids
+                ]
+                
+                # Collect results in request order so the response is deterministic
+                for team_id, future in team_futures:
+                    try:
+                        # Games already carry their team_id, season, team_name and id
+                        games, season, team_name = future.result()
+                        all_games.extend(games)
+                    except Exception as e:
+                        failed_teams.append({
+                            'team_id': team_id,
+                            'error': str(e),
+                            'errorType': e.__class__.__name__
+                        })
             
             # Return results even if some teams failed or have no future games
             response_body = {
@@ -373,21 +859,15 @@ def lambda_handler(event, context):
                 
             return {
                 'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps(response_body)
+                'headers': _JSON_HEADERS,
+                'body': _json_dumps(response_body)
             }
                 
         except Exception as e:
             return {
                 'statusCode': 500,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
+                'headers': _JSON_HEADERS,
+                'body': _json_dumps({
                     'error': f'An unexpected error occurred: {str(e)}',
                     'errorType': e.__class__.__name__,
                     'processed_team_ids': valid_team_ids,
@@ -402,16 +882,13 @@ def lambda_handler(event, context):
             # For POST requests, the games will be in the body
             if event.get('body'):
                 try:
-                    body = json.loads(event.get('body', '{}'))
+                    body = _json_loads(event.get('body', '{}'))
                     games = body.get('games', [])
                 except json.JSONDecodeError:
                     return {
                         'statusCode': 400,
-                        'headers': {
-                            'Content-Type': 'application/json',
-                            'Access-Control-Allow-Origin': '*'
-                        },
-                        'body': json.dumps({'error': 'Invalid JSON in request body'})
+                        'headers': _JSON_HEADERS,
+                        'body': _json_dumps({'error': 'Invalid JSON in request body'})
                     }
             else:
                 games = query_params.get('games', [])
@@ -419,11 +896,8 @@ def lambda_handler(event, context):
             if not games:
                 return {
                     'statusCode': 400,
-                    'headers': {
-                        'Content-Type': 'application/json',
-                        'Access-Control-Allow-Origin': '*'
-                    },
-                    'body': json.dumps({'error': 'No games provided for calendar'})
+                    'headers': _JSON_HEADERS,
+                    'body': _json_dumps({'error': 'No games provided for calendar'})
                 }
                 
             calendar_text = create_calendar_events(games)
@@ -431,23 +905,16 @@ def lambda_handler(event, context):
             # Return the raw calendar data with correct headers
             return {
                 'statusCode': 200,
-                'headers': {
-                    'Content-Type': 'text/calendar',
-                    'Access-Control-Allow-Origin': '*',
-                    'Content-Disposition': 'attachment; filename="soccer_schedule_{season}.ics"'
-                },
+                'headers': _ICS_DOWNLOAD_HEADERS,
                 'body': calendar_text
             }
             
         except Exception as e:
-            print(f"Error generating calendar: {str(e)}")  # Add logging
+            logger.error("Error generating calendar: %s", e)
             return {
                 'statusCode': 500,
-                'headers': {
-                    'Content-Type': 'application/json',
-                    'Access-Control-Allow-Origin': '*'
-                },
-                'body': json.dumps({
+                'headers': _JSON_HEADERS,
+                'body': _json_dumps({
                     'error': f'Failed to generate calendar: {str(e)}',
                     'errorType': e.__class__.__name__
                 })
@@ -456,11 +923,8 @@ def lambda_handler(event, context):
     # Default error for invalid action
     return {
         'statusCode': 400,
-        'headers': {
-            'Content-Type': 'application/json',
-            'Access-Control-Allow-Origin': '*'
-        },
-        'body': json.dumps({'error': 'Invalid action'})
+        'headers': _JSON_HEADERS,
+        'body': _json_dumps({'error': 'Invalid action'})
     }
 
 if __name__ == "__main__":
@@ -468,6 +932,10 @@ if __name__ == "__main__":
     CLI mode for local testing of the soccer schedule scraper.
     This allows testing the Lambda functionality from the command line.
     """
+    # Lambda provides a log handler; locally one is needed for the INFO progress lines to
+    # show, printed bare so they read like the rest of the CLI output
+    logging.basicConfig(level=logger.level, format="%(message)s")
+    
     team_ids = input("Enter team IDs (space separated): ").split()
     processed = []
     failed = []
@@ -481,20 +949,25 @@ if __name__ == "__main__":
             print(f"Season: {season}")
             print(f"Found {len(games)} games:")
             
-            # Print game details
+            # Print game details, buffered into a single write instead of one print per line
+            game_lines = []
             for game in games:
-                print(f"\nDate/Time: {game['date']}")
-                print(f"Field: {game['field']}")
-                print(f"Home Team: {game['home_team']}")
-                print(f"Away Team: {game['away_team']}")
-                print("-" * 40)
+                game_lines.append(
+                    f"\nDate/Time: {game['date']}\n"
+                    f"Field: {game['field']}\n"
+                    f"Home Team: {game['home_team']}\n"
+                    f"Away Team: {game['away_team']}\n"
+                    f"{'-' * 40}\n"
+                )
+            sys.stdout.write("".join(game_lines))
             
-            # Create calendar using team name from API response
-            calendar_text = create_calendar_events(games)
+            # Create calendar file named using team name from API response
             calendar_file = f"{season}_{team_name}_{team_id}.ics"
             
-            with open(calendar_file, 'w', newline='\r\n') as f:
-                f.write(calendar_text)
+            # Stream the calendar straight into the file instead of building the whole text first.
+            # The chunks already use CRLF line endings, so disable newline translation.
+            with open(calendar_file, 'w', encoding='utf-8', newline='', buffering=65536) as f:
+                f.writelines(_iter_calendar_chunks(games))
             print(f"\nCalendar file '{calendar_file}' created successfully!")
             processed.append(team_id)
             